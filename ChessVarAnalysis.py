@@ -0,0 +1,429 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Contains an analysis service that searches the position of a ChessVar game in a background worker
+# while the player to move is thinking, so a hint is ready as soon as it is asked for.
+
+import multiprocessing
+import os
+import sys
+import threading
+
+from ChessVarPool import pack_position, unpack_position
+
+# Piece values used to score a position. The King can be captured in this variant, and losing the only one loses the
+# game, so it is valued like any other piece.
+PIECE_VALUES = {'Pawn': 1, 'Knight': 3, 'Bishop': 3, 'Rook': 5, 'Queen': 9, 'King': 4}
+
+# Penalty for each type of piece a team has only one of left, since losing it would lose the game.
+LAST_PIECE_PENALTY = 2
+
+WIN_SCORE = 10000
+
+COLUMNS = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H')
+ROWS = ('1', '2', '3', '4', '5', '6', '7', '8')
+
+
+class _SearchCancelled(Exception):
+    """
+    Raised inside a search to unwind it as soon as the analysis is stopped.
+    """
+
+
+def evaluate(game):
+    """
+    Scores a position for the player who moves next in the search. Higher is better.
+
+    make_move does not change the turn after a winning move, so in a won position get_current_turn is the winner,
+    who has just moved. The position is scored as lost for the side to reply, which is what the search negates.
+    """
+
+    if game.get_game_state() != 'UNFINISHED':
+        return -WIN_SCORE
+
+    score = 0
+    for piece_type, value in PIECE_VALUES.items():
+        white_count = game.get_white_pieces_remaining()[piece_type]
+        black_count = game.get_black_pieces_remaining()[piece_type]
+        score += value * (white_count - black_count)
+        if white_count == 1:
+            score -= LAST_PIECE_PENALTY
+        if black_count == 1:
+            score += LAST_PIECE_PENALTY
+
+    return score if game.get_current_turn() == 'WHITE' else -score
+
+
+def generate_moves(game):
+    """
+    Returns a list of (from_square, to_square) pairs for every move of the player to move that the pieces' movement
+    rules accept. The board is left unchanged.
+    """
+
+    board = game.get_board()
+    player = game.get_current_turn()
+    moves = []
+
+    for column1 in COLUMNS:
+        for row1 in ROWS:
+            piece = board[column1][row1]
+            if piece is None or piece.get_team() != player:
+                continue
+
+            for column2 in COLUMNS:
+                for row2 in ROWS:
+                    target = board[column2][row2]
+                    if (column2 == column1 and row2 == row1) or (target is not None and target.get_team() == player):
+                        continue
+
+                    # Pawn.is_valid_move may mark the pawn as moved, so its flag is restored after the check.
+                    has_moved = piece.get_has_moved() if piece.get_type() == 'Pawn' else None
+                    try:
+                        valid = piece.is_valid_move(column2 + row2, board)
+                    except (KeyError, ValueError):
+                        valid = False
+                    if has_moved is not None:
+                        piece._has_moved = has_moved
+
+                    if valid:
+                        moves.append((column1 + row1, column2 + row2))
+
+    return moves
+
+
+def _make_move(game, from_square, to_square):
+    """
+    Plays a move on 'game' and returns the information needed to take it back with _unmake_move, or None if the game
+    rejected the move (in which case it has already been taken back).
+    """
+
+    board = game.get_board()
+    piece = board[from_square[0]][from_square[1]]
+    captured = board[to_square[0]][to_square[1]]
+    has_moved = piece.get_has_moved() if piece.get_type() == 'Pawn' else None
+    undo = (from_square, to_square, piece, captured, has_moved, game.get_game_state(), game.get_current_turn())
+
+    try:
+        accepted = game.make_move(from_square, to_square)
+    except (KeyError, ValueError):
+        accepted = False
+
+    if not accepted:
+        _unmake_move(game, undo)
+        return None
+    return undo
+
+
+def _unmake_move(game, undo):
+    """
+    Takes back a move played by _make_move.
+    """
+
+    from_square, to_square, piece, captured, has_moved, game_state, current_player = undo
+    board = game.get_board()
+
+    if board[to_square[0]][to_square[1]] is piece and captured is not None:
+        if captured.get_team() == 'WHITE':
+            game.get_white_pieces_remaining()[captured.get_type()] += 1
+        else:
+            game.get_black_pieces_remaining()[captured.get_type()] += 1
+
+    board[to_square[0]][to_square[1]] = captured
+    board[from_square[0]][from_square[1]] = piece
+    piece.set_position(from_square)
+    if has_moved is not None:
+        piece._has_moved = has_moved
+
+    game._game_state = game_state
+    game._current_player = current_player
+
+
+def search(game, depth, principal_variation=(), cancel_event=None, nodes=None):
+    """
+    Negamax alpha-beta search of 'game' to 'depth' moves. Moves on 'principal_variation', the best line from a
+    previous search, are tried first. The search raises _SearchCancelled as soon as 'cancel_event' is set, and adds
+    one to 'nodes.value' for every position it visits. ChessVar prints while the search plays moves.
+
+    Returns: a tuple of the score for the player to move and the best line found
+    """
+
+    return _negamax(game, depth, -WIN_SCORE - 1, WIN_SCORE + 1, list(principal_variation), cancel_event, nodes)
+
+
+def _negamax(game, depth, alpha, beta, principal_variation, cancel_event, nodes):
+    """
+    Recursive body of search.
+    """
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise _SearchCancelled
+    if nodes is not None:
+        nodes.value += 1
+
+    if depth == 0 or game.get_game_state() != 'UNFINISHED':
+        return evaluate(game), []
+
+    moves = generate_moves(game)
+    if principal_variation and principal_variation[0] in moves:
+        moves.remove(principal_variation[0])
+        moves.insert(0, principal_variation[0])
+
+    best_line = []
+    best_score = None
+
+    for move in moves:
+        undo = _make_move(game, move[0], move[1])
+        if undo is None:
+            continue
+
+        following = principal_variation[1:] if principal_variation and move == principal_variation[0] else []
+        try:
+            score, line = _negamax(game, depth - 1, -beta, -alpha, following, cancel_event, nodes)
+        finally:
+            _unmake_move(game, undo)
+        score = -score
+
+        if best_score is None or score > best_score:
+            best_score = score
+            best_line = [move] + line
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+
+    if best_score is None:
+        return evaluate(game), []
+    return best_score, best_line
+
+
+def _worker_main(connection, cancel_event, nodes):
+    """
+    Body of the analysis worker process. Receives jobs of (job id, packed position, principal variation, first depth,
+    last depth) and answers with ('result', job id, depth, line) after every completed depth and ('done', job id) when
+    the job finishes or is cancelled. None ends the process.
+    """
+
+    # ChessVar prints every move it checks; in this process that output is only noise. The parent's stdout is untouched.
+    sys.stdout = open(os.devnull, 'w')
+
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+
+        job_id, position, principal_variation, depth, max_depth = job
+        game = unpack_position(position)
+        try:
+            while depth <= max_depth:
+                score, principal_variation = search(game, depth, principal_variation, cancel_event, nodes)
+                connection.send(('result', job_id, depth, principal_variation))
+                if abs(score) == WIN_SCORE:
+                    break
+                depth += 1
+        except _SearchCancelled:
+            pass
+        connection.send(('done', job_id))
+
+
+class Analyzer:
+    """
+    Represents a background analysis of a ChessVar game. While the player to move is thinking, a worker process runs
+    an iterative deepening alpha-beta search on a copy of the position; running it in its own process keeps the output
+    ChessVar prints for every move it checks out of the caller's stdout. Moves are played through the Analyzer's
+    make_move, which stops the search, plays the move on the game, and restarts the search on the new position. If the
+    move played was the first move of the line the search expected, the rest of that line, its depth, and the node
+    count are kept, so a hint is available immediately.
+
+    Contains the following methods:
+        -start: starts analyzing the current position
+        -stop: cancels the analysis and waits for the worker to acknowledge it
+        -close: stops the analysis and shuts the worker process down
+        -make_move: plays a move on the game and continues the analysis from the resulting position
+        -get_best_move: returns the best move found so far as a (from_square, to_square) pair, or None
+        -get_principal_variation: returns the best line found so far as a list of moves
+        -get_depth: returns the depth of the best line found so far
+        -get_nodes: returns the number of positions searched for the best line found so far, including the search
+         before a move that matched the line
+    """
+
+    def __init__(self, game, max_depth=4):
+        """
+        Initializes an analysis of 'game', searching up to 'max_depth' moves ahead. The worker process is not started
+        until start is called.
+        """
+
+        self._game = game
+        self._max_depth = max_depth
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+
+        self._process = None
+        self._connection = None
+        self._listener = None
+        self._cancel_event = None
+        self._nodes = None
+
+        self._job_id = 0
+        self._running = False
+        self._principal_variation = []
+        self._depth = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_best_move(self):
+        """
+        Returns the first move of the best line found so far, or None if no search has completed.
+        """
+        with self._lock:
+            return self._principal_variation[0] if self._principal_variation else None
+
+    def get_principal_variation(self):
+        """
+        Returns a copy of the best line found so far.
+        """
+        with self._lock:
+            return list(self._principal_variation)
+
+    def get_depth(self):
+        """
+        Returns the depth of the best line found so far.
+        """
+        with self._lock:
+            return self._depth
+
+    def get_nodes(self):
+        """
+        Returns the number of positions searched for the best line found so far.
+        """
+        return self._nodes.value if self._nodes is not None else 0
+
+    def is_running(self):
+        """
+        Returns True while the worker is searching.
+        """
+        with self._lock:
+            return self._running
+
+    def start(self):
+        """
+        Starts analyzing the current position in the worker process, unless the game is over or an analysis is
+        already running.
+        """
+
+        if self._game.get_game_state() != 'UNFINISHED':
+            return
+        if self._process is None:
+            self._start_worker()
+
+        with self._lock:
+            if self._running:
+                return
+            self._job_id += 1
+            self._running = True
+            job = (self._job_id, bytes(pack_position(self._game)), list(self._principal_variation), self._depth + 1,
+                   self._max_depth)
+        self._connection.send(job)
+
+    def stop(self):
+        """
+        Cancels the analysis. The search checks for cancellation at every position, so this returns promptly.
+        """
+
+        if self._process is None:
+            return
+
+        self._cancel_event.set()
+        with self._lock:
+            while self._running and self._listener.is_alive():
+                self._finished.wait(0.1)
+            self._running = False
+        self._cancel_event.clear()
+
+    def close(self):
+        """
+        Stops the analysis and shuts down the worker process.
+        """
+
+        if self._process is None:
+            return
+
+        self.stop()
+        self._connection.send(None)
+        self._process.join()
+        self._listener.join()
+        self._connection.close()
+        self._process = None
+
+    def make_move(self, from_square, to_square):
+        """
+        Plays a move on the analyzed game and restarts the analysis from the resulting position.
+
+        Inputs: 2x strings representing square moved from, and square moved to, respectively
+
+        Returns: the result of the game's make_move
+        """
+
+        self.stop()
+
+        accepted = self._game.make_move(from_square, to_square)
+
+        if accepted:
+            played = (from_square.upper(), to_square.upper())
+            with self._lock:
+                if self._principal_variation and self._principal_variation[0] == played:
+                    self._principal_variation = self._principal_variation[1:]
+                    self._depth = max(self._depth - 1, 0)
+                else:
+                    self._principal_variation = []
+                if not self._principal_variation:
+                    self._depth = 0
+                    if self._nodes is not None:
+                        self._nodes.value = 0
+
+        self.start()
+        return accepted
+
+    def _start_worker(self):
+        """
+        Starts the worker process and the thread that collects its results.
+        """
+
+        self._connection, worker_connection = multiprocessing.Pipe()
+        self._cancel_event = multiprocessing.Event()
+        self._nodes = multiprocessing.RawValue('q', 0)
+        self._process = multiprocessing.Process(target=_worker_main,
+                                                args=(worker_connection, self._cancel_event, self._nodes), daemon=True)
+        self._process.start()
+        worker_connection.close()
+
+        self._listener = threading.Thread(target=self._listen, args=(self._connection,), daemon=True)
+        self._listener.start()
+
+    def _listen(self, connection):
+        """
+        Listener thread body: records results from the worker, ignoring those of cancelled jobs.
+        """
+
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                break
+
+            with self._lock:
+                if message[1] != self._job_id:
+                    continue
+                if message[0] == 'result':
+                    self._depth = message[2]
+                    self._principal_variation = message[3]
+                else:
+                    self._running = False
+                    self._finished.notify_all()
+
+        with self._lock:
+            self._running = False
+            self._finished.notify_all()
@@ -0,0 +1,387 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Microbenchmarks for the public API of ChessVar. Times each scenario with warm-up and repeats, writes
+# the results as JSON, and compares them to a saved baseline, failing if any scenario has slowed down past a threshold.
+#
+# Usage: python ChessVarBenchmark.py [--output results.json] [--baseline baseline.json] [--threshold 0.2]
+#                                    [--min-time 0.02] [--min-delta-us 0.05] [--only text] [--save-baseline]
+
+import argparse
+import contextlib
+import gc
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+
+from ChessVar import ChessVar
+
+# Moves timed for each piece type, as (setup moves, accepted move, rejected move). The setup moves are played before
+# timing starts and only apply to the accepted move; the rejected move is tried from the starting position.
+MOVE_SCENARIOS = {
+    'pawn': ([], ('e2', 'e4'), ('e2', 'e5')),
+    'knight': ([], ('b1', 'c3'), ('b1', 'b3')),
+    'bishop': ([('e2', 'e4'), ('e7', 'e5')], ('f1', 'c4'), ('c1', 'e3')),
+    'rook': ([('a2', 'a4'), ('a7', 'a5')], ('a1', 'a3'), ('a1', 'a3')),
+    'queen': ([('e2', 'e4'), ('e7', 'e5')], ('d1', 'h5'), ('d1', 'd3')),
+    'king': ([('e2', 'e4'), ('e7', 'e5')], ('e1', 'e2'), ('e1', 'e3')),
+}
+
+# A short game ending with WHITE capturing BLACK's only Queen.
+FULL_GAME = [('e2', 'e4'), ('d7', 'd5'), ('e4', 'd5'), ('d8', 'd5'), ('b1', 'c3'), ('a7', 'a6'), ('c3', 'd5')]
+
+# Name of the workload timed alongside the scenarios to measure the speed of the machine; see _reference_scenario.
+REFERENCE = 'reference'
+
+
+class _NullWriter:
+    """
+    Discards everything written to it. ChessVar prints on every move, which would otherwise flood the terminal.
+    """
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _new_game(setup_moves):
+    """
+    Returns a new ChessVar with 'setup_moves' already played.
+    """
+
+    game = ChessVar()
+    for from_square, to_square in setup_moves:
+        if not game.make_move(from_square, to_square):
+            raise ValueError(f"Benchmark setup move {from_square}-{to_square} was rejected")
+    return game
+
+
+def _move_scenario(setup_moves, move, expected):
+    """
+    Returns a scenario playing 'move' once on each of 'number' freshly set up games. Each game is set up just before
+    its move and only the move is timed, so the timing does not depend on thousands of games built in advance falling
+    out of the CPU cache.
+    """
+
+    def prepare(number):
+        return number
+
+    def run(number):
+        elapsed = 0.0
+        for _ in range(number):
+            game = _new_game(setup_moves)
+            start = time.perf_counter()
+            accepted = game.make_move(move[0], move[1])
+            elapsed += time.perf_counter() - start
+            if accepted is not expected:
+                raise ValueError(f"Benchmark move {move[0]}-{move[1]} did not return {expected}")
+        return elapsed
+
+    return prepare, run
+
+
+def _construction_scenario():
+    """
+    Returns a scenario timing ChessVar().
+    """
+
+    def prepare(number):
+        return number
+
+    def run(number):
+        start = time.perf_counter()
+        for _ in itertools.repeat(None, number):
+            ChessVar()
+        return time.perf_counter() - start
+
+    return prepare, run
+
+
+def _get_board_scenario():
+    """
+    Returns a scenario timing get_board on one game.
+    """
+
+    def prepare(number):
+        return ChessVar(), number
+
+    def run(prepared):
+        game, number = prepared
+        get_board = game.get_board
+        start = time.perf_counter()
+        for _ in itertools.repeat(None, number):
+            get_board()
+        return time.perf_counter() - start
+
+    return prepare, run
+
+
+def _full_game_scenario():
+    """
+    Returns a scenario timing the construction and replay of FULL_GAME.
+    """
+
+    def prepare(number):
+        return number
+
+    def run(number):
+        start = time.perf_counter()
+        for _ in itertools.repeat(None, number):
+            game = ChessVar()
+            for from_square, to_square in FULL_GAME:
+                game.make_move(from_square, to_square)
+            if game.get_game_state() != 'WHITE_WON':
+                raise ValueError("Benchmark game did not end with WHITE_WON")
+        return time.perf_counter() - start
+
+    return prepare, run
+
+
+def _reference_scenario():
+    """
+    Returns a workload that does not use ChessVar, so changes to ChessVar cannot change its time: building a board of
+    dictionaries like ChessVar's and looking up every square. It exercises the same parts of the interpreter as the
+    scenarios, so when the machine is slowed down by something else it slows down by about as much as they do.
+    """
+
+    columns = 'ABCDEFGH'
+    rows = '12345678'
+
+    def prepare(number):
+        return number
+
+    def run(number):
+        start = time.perf_counter()
+        for _ in itertools.repeat(None, number):
+            board = {column: {row: (column + row, row in '1278') for row in rows} for column in columns}
+            occupied = 0
+            for column in columns:
+                for row in rows:
+                    if board[column][row][1]:
+                        occupied += 1
+        return time.perf_counter() - start
+
+    return prepare, run
+
+
+def get_scenarios():
+    """
+    Returns a dictionary of scenario name to (prepare, run) functions. prepare(number) builds the untimed input for
+    'number' iterations, and run(prepared) performs the iterations and returns the seconds spent in the timed part.
+    """
+
+    scenarios = {'construct': _construction_scenario()}
+    for piece_name, (setup, accepted_move, rejected_move) in MOVE_SCENARIOS.items():
+        scenarios[f'make_move_{piece_name}_accepted'] = _move_scenario(setup, accepted_move, True)
+        scenarios[f'make_move_{piece_name}_rejected'] = _move_scenario([], rejected_move, False)
+    scenarios['get_board'] = _get_board_scenario()
+    scenarios['full_game'] = _full_game_scenario()
+    return scenarios
+
+
+def _time_round(prepare, run, number):
+    """
+    Prepares and runs one round of 'number' iterations with ChessVar output discarded.
+
+    Returns: the timed seconds reported by run. Garbage collection is disabled while it runs, as timeit does, so the
+     timing does not depend on when a collection happens to fall.
+    """
+
+    with contextlib.redirect_stdout(_NullWriter()):
+        prepared = prepare(number)
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return run(prepared)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+
+def calibrate(prepare, run, min_time):
+    """
+    Finds how many iterations make one round of a scenario take at least 'min_time' seconds, trying 1, 2, 5, 10, 20,
+    50, ... iterations like timeit.Timer.autorange.
+
+    Returns: the number of iterations per round
+    """
+
+    base = 1
+    while True:
+        for multiple in (1, 2, 5):
+            number = base * multiple
+            if _time_round(prepare, run, number) >= min_time:
+                return number
+        base *= 10
+
+
+def _summarize(number, timings):
+    """
+    Returns a dictionary with the iterations per round and the best, median, and mean time per iteration in seconds.
+    """
+    return {'number': number, 'best': min(timings), 'median': statistics.median(timings),
+            'mean': statistics.mean(timings)}
+
+
+def time_scenario(prepare, run, repeats, warmup, min_time):
+    """
+    Times a single scenario. The number of iterations per round is first calibrated so each round takes at least
+    'min_time' seconds, then 'warmup' untimed rounds are run, then 'repeats' timed rounds.
+
+    Returns: a dictionary of timing results, as described in _summarize
+    """
+
+    number = calibrate(prepare, run, min_time)
+    for _ in range(warmup):
+        _time_round(prepare, run, number)
+    timings = [_time_round(prepare, run, number) / number for _ in range(repeats)]
+    return _summarize(number, timings)
+
+
+def run_benchmarks(repeats=5, warmup=1, min_time=0.02, only=None, names=None):
+    """
+    Runs every scenario, or only those whose names contain 'only' or are in 'names', together with the REFERENCE
+    workload. Every scenario is calibrated and warmed up first, then the timed rounds are interleaved, one round of
+    each scenario per pass. A stretch of time in which the machine is busy then slows one round of many scenarios
+    instead of every round of one, and the best time drops it.
+
+    Returns: a dictionary of scenario name to timing results, as described in _summarize
+    """
+
+    scenarios = {REFERENCE: _reference_scenario()}
+    scenarios.update((name, scenario) for name, scenario in get_scenarios().items()
+                     if (only is None or only in name) and (names is None or name in names))
+
+    numbers = {}
+    for name, (prepare, run) in scenarios.items():
+        numbers[name] = calibrate(prepare, run, min_time)
+        for _ in range(warmup):
+            _time_round(prepare, run, numbers[name])
+
+    timings = {name: [] for name in scenarios}
+    for _ in range(repeats):
+        for name, (prepare, run) in scenarios.items():
+            timings[name].append(_time_round(prepare, run, numbers[name]) / numbers[name])
+
+    return {name: _summarize(numbers[name], timings[name]) for name in scenarios}
+
+
+def get_machine_speed(results, baseline):
+    """
+    Returns how many times longer the REFERENCE workload took in 'results' than in 'baseline', or 1.0 if either lacks
+    it.
+    """
+
+    if REFERENCE not in results or REFERENCE not in baseline:
+        return 1.0
+    return results[REFERENCE]['best'] / baseline[REFERENCE]['best']
+
+
+def compare(results, baseline, threshold, min_delta=0.0):
+    """
+    Compares the best timings of 'results' against 'baseline'. The best of several rounds is the timing least
+    disturbed by the rest of the machine, and a machine that is slower or faster as a whole is allowed for by dividing
+    the current timings by get_machine_speed. A scenario whose baseline rounds were noisier than 'threshold' (its
+    median more than 'threshold' above its best) is only flagged if it slowed down by more than that spread. A slowdown
+    of less than 'min_delta' seconds per iteration is never flagged: for calls as cheap as get_board, a few nanoseconds
+    of difference between processes is a large fraction of the time but says nothing about the code.
+
+    Returns: a list of (name, baseline best, current best adjusted for machine speed, relative change) for every
+     scenario that slowed down by more than the allowed amount
+    """
+
+    speed = get_machine_speed(results, baseline)
+    regressions = []
+    for name, timing in results.items():
+        # Scenarios missing from the baseline are reported by main.
+        if name == REFERENCE or name not in baseline:
+            continue
+        before = baseline[name]['best']
+        after = timing['best'] / speed
+        spread = (baseline[name]['median'] - before) / before
+        change = (after - before) / before
+        if change > max(threshold, spread) and after - before > min_delta:
+            regressions.append((name, before, after, change))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Runs the benchmark suite from the command line. Returns 1 if a regression was found, otherwise 0.
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark the ChessVar API.")
+    parser.add_argument('--output', default='bench_results.json', help="file to write results to")
+    parser.add_argument('--baseline', default='bench_baseline.json', help="baseline file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown, e.g. 0.2 for 20%%")
+    parser.add_argument('--min-delta-us', type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many microseconds per iteration")
+    parser.add_argument('--save-baseline', action='store_true', help="save the results as the new baseline")
+    parser.add_argument('--min-time', type=float, default=0.02, help="minimum seconds per timed round")
+    parser.add_argument('--repeats', type=int, default=5, help="timed rounds per scenario")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed rounds per scenario")
+    parser.add_argument('--only', help="run only scenarios whose names contain this text")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.repeats, args.warmup, args.min_time, args.only)
+
+    for name, timing in results.items():
+        print(f"{name:32} best {timing['best'] * 1e6:10.3f} us   median {timing['median'] * 1e6:10.3f} us   "
+              f"x{timing['number']}")
+
+    report = {'python': platform.python_version(), 'min_time': args.min_time, 'repeats': args.repeats,
+              'results': results}
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+
+    try:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+    except FileNotFoundError:
+        baseline = None
+
+    if args.save_baseline:
+        # Scenarios that were not run keep their saved timings, so saving with --only does not drop them from gating.
+        merged = dict(baseline or {})
+        merged.update(results)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(dict(report, results=merged), baseline_file, indent=2)
+        print(f"Saved {len(results)} of {len(merged)} baseline scenarios to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    for name in sorted(set(baseline) - set(results)):
+        print(f"NOT RUN: {name} is in the baseline but was not run")
+    for name in sorted(set(results) - set(baseline)):
+        print(f"NOT GATED: {name} has no baseline; run with --save-baseline to add it")
+
+    print(f"Machine speed: the reference workload took {get_machine_speed(results, baseline):.2f}x its baseline time; "
+          f"timings are divided by this before comparing.")
+    regressions = compare(results, baseline, args.threshold, args.min_delta_us / 1e6)
+    if regressions:
+        # A slowdown caused by the rest of the machine can last for seconds but rarely for longer, so suspected
+        # regressions are timed again over twice as many rounds and only reported if they are still too slow.
+        print(f"Confirming {len(regressions)} suspected regression(s)...")
+        retried = run_benchmarks(args.repeats * 2, args.warmup, args.min_time,
+                                 names={name for name, _, _, _ in regressions})
+        regressions = compare(retried, baseline, args.threshold, args.min_delta_us / 1e6)
+
+    for name, before, after, change in regressions:
+        print(f"REGRESSION: {name} {before * 1e6:.2f} us -> {after * 1e6:.2f} us (+{change:.0%})")
+    if regressions:
+        return 1
+
+    print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
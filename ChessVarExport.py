@@ -0,0 +1,282 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Replays archived games of the chess variant through ChessVar and exports every position as training
+# tensors, written in fixed-size chunks to memory-mapped .npy files so datasets larger than memory can be produced and
+# read back lazily.
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from ChessVar import ChessVar
+
+PIECE_TYPES = ('Pawn', 'Rook', 'Knight', 'Bishop', 'Queen', 'King')
+TEAMS = ('WHITE', 'BLACK')
+COLUMNS = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H')
+ROWS = ('1', '2', '3', '4', '5', '6', '7', '8')
+OUTCOMES = {'UNFINISHED': 0, 'WHITE_WON': 1, 'BLACK_WON': -1}
+
+# Names of the arrays written for every chunk, in the order they are stored.
+ARRAY_NAMES = ('planes', 'side', 'counts', 'outcome')
+
+
+def encode_position(game):
+    """
+    Encodes the current position of a ChessVar game as arrays.
+
+    Input: a ChessVar game
+
+    Returns: a tuple of
+        -planes: uint8 array of shape (12, 8, 8). Plane 'team * 6 + type' marks the squares holding that piece, indexed
+         by [row - 1][column - 'A'], with types ordered as in PIECE_TYPES and teams as in TEAMS.
+        -side: 0 if it is WHITE's turn, 1 if it is BLACK's turn
+        -counts: uint8 array of shape (12,), the white then black pieces remaining, by type
+    """
+
+    planes = np.zeros((12, 8, 8), dtype=np.uint8)
+    board = game.get_board()
+
+    for column_index, column in enumerate(COLUMNS):
+        for row_index, row in enumerate(ROWS):
+            piece = board[column][row]
+            if piece is not None:
+                plane = TEAMS.index(piece.get_team()) * 6 + PIECE_TYPES.index(piece.get_type())
+                planes[plane, row_index, column_index] = 1
+
+    side = TEAMS.index(game.get_current_turn())
+
+    white_pieces = game.get_white_pieces_remaining()
+    black_pieces = game.get_black_pieces_remaining()
+    counts = np.array([white_pieces[piece_type] for piece_type in PIECE_TYPES] +
+                      [black_pieces[piece_type] for piece_type in PIECE_TYPES], dtype=np.uint8)
+
+    return planes, side, counts
+
+
+def replay_game(moves):
+    """
+    Replays a game move by move, starting from a new ChessVar. Replay stops at the first move that the game rejects.
+
+    Input: an iterable of (from_square, to_square) pairs
+
+    Returns: a tuple of the list of encoded positions (see encode_position), starting with the initial position, the
+     final game state, and whether every move was accepted
+    """
+
+    game = ChessVar()
+    positions = [encode_position(game)]
+    complete = True
+
+    # make_move reports every move on stdout, which would swamp the output of a large export.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for from_square, to_square in moves:
+            try:
+                accepted = game.make_move(from_square, to_square)
+            except (KeyError, ValueError):
+                accepted = False
+            if not accepted:
+                complete = False
+                break
+            positions.append(encode_position(game))
+
+    return positions, game.get_game_state(), complete
+
+
+class PositionExporter:
+    """
+    Streams positions from replayed games into chunked, memory-mapped .npy files. Only the current chunk is held in
+    memory, so the size of an export is bounded by disk space rather than RAM.
+
+    Every chunk 'n' is written as four files named '<prefix>-<n>-<array>.npy', one for each name in ARRAY_NAMES:
+        -planes: uint8 (N, 12, 8, 8) piece planes
+        -side: uint8 (N,) side to move, 0 for WHITE and 1 for BLACK
+        -counts: uint8 (N, 12) white then black pieces remaining, by type
+        -outcome: int8 (N,) final result of the game the position came from: 1 WHITE_WON, -1 BLACK_WON, 0 UNFINISHED
+
+    close also writes '<prefix>-manifest.json' listing the number of positions in each chunk. Readers only use the
+    chunks it lists, so chunks left over from an earlier export to the same prefix are ignored.
+
+    Contains the following methods:
+        -add_game: replays a game and queues all its positions for export
+        -close: writes any partially filled chunk and the manifest, and returns the number of positions exported
+    """
+
+    def __init__(self, prefix, chunk_size=4096, deduplicate=False, skip_truncated=True, max_seen=None):
+        """
+        Initializes an exporter writing to files starting with 'prefix'. If 'deduplicate' is True, a position (board,
+        side to move, and piece counts) is only exported the first time it is seen. If 'skip_truncated' is True, games
+        containing a move the game rejects are not exported, since their outcome would be mislabelled as UNFINISHED.
+
+        Deduplication keeps a digest of every unique position in a Python set, about 100 bytes each, so its memory
+        grows with the number of unique positions rather than staying bounded like the chunks. Setting 'max_seen'
+        bounds it: once that many digests are held the set is cleared, so positions are only deduplicated within
+        windows of 'max_seen' unique positions and a position may be exported once per window.
+        """
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        # The manifest of an earlier export to this prefix would describe chunks that are about to be overwritten.
+        if os.path.exists(manifest_path(prefix)):
+            os.remove(manifest_path(prefix))
+
+        self._prefix = prefix
+        self._chunk_size = chunk_size
+        self._deduplicate = deduplicate
+        self._max_seen = max_seen
+        self._skip_truncated = skip_truncated
+        self._seen = set()
+        self._buffer = []
+        self._chunk_lengths = []
+        self._positions_written = 0
+        self._games_truncated = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # An export stopped by an exception gets no manifest, so readers do not mistake it for a complete one.
+        if exc_type is None:
+            self.close()
+        else:
+            self._buffer = []
+            self._closed = True
+
+    def get_positions_written(self):
+        """
+        Returns the number of positions written to disk so far.
+        """
+        return self._positions_written
+
+    def get_games_truncated(self):
+        """
+        Returns the number of games that contained a rejected move.
+        """
+        return self._games_truncated
+
+    def add_game(self, moves):
+        """
+        Replays a game and queues each of its positions, labelled with the game's final outcome.
+
+        Input: an iterable of (from_square, to_square) pairs
+
+        Returns: the number of positions queued from this game, 0 if it was skipped
+        """
+
+        positions, game_state, complete = replay_game(moves)
+        if not complete:
+            self._games_truncated += 1
+            if self._skip_truncated:
+                return 0
+
+        outcome = OUTCOMES[game_state]
+        added = 0
+
+        for planes, side, counts in positions:
+            if self._deduplicate:
+                key = hashlib.blake2b(planes.tobytes() + bytes([side]) + counts.tobytes(), digest_size=16).digest()
+                if key in self._seen:
+                    continue
+                if self._max_seen is not None and len(self._seen) >= self._max_seen:
+                    self._seen.clear()
+                self._seen.add(key)
+
+            self._buffer.append((planes, side, counts, outcome))
+            added += 1
+
+            if len(self._buffer) == self._chunk_size:
+                self._write_chunk()
+
+        return added
+
+    def close(self):
+        """
+        Writes any queued positions as a final, shorter chunk, then the manifest.
+
+        Returns: the total number of positions exported
+        """
+
+        if self._closed:
+            return self._positions_written
+
+        if self._buffer:
+            self._write_chunk()
+
+        manifest = {'chunk_lengths': self._chunk_lengths, 'games_truncated': self._games_truncated}
+        temporary_path = manifest_path(self._prefix) + '.tmp'
+        with open(temporary_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temporary_path, manifest_path(self._prefix))
+
+        self._closed = True
+        return self._positions_written
+
+    def _write_chunk(self):
+        """
+        Writes the queued positions to a new set of chunk files and clears the queue.
+        """
+
+        length = len(self._buffer)
+        shapes = {'planes': (length, 12, 8, 8), 'side': (length,), 'counts': (length, 12), 'outcome': (length,)}
+        dtypes = {'planes': np.uint8, 'side': np.uint8, 'counts': np.uint8, 'outcome': np.int8}
+
+        for array_index, name in enumerate(ARRAY_NAMES):
+            path = chunk_path(self._prefix, len(self._chunk_lengths), name)
+            array = open_memmap(path, mode='w+', dtype=dtypes[name], shape=shapes[name])
+            for position_index, position in enumerate(self._buffer):
+                array[position_index] = position[array_index]
+            array.flush()
+            del array
+
+        self._chunk_lengths.append(length)
+        self._positions_written += length
+        self._buffer = []
+
+
+def chunk_path(prefix, chunk_index, name):
+    """
+    Returns the path of array 'name' in chunk 'chunk_index' of the export starting with 'prefix'.
+    """
+    return f"{prefix}-{chunk_index:05d}-{name}.npy"
+
+
+def manifest_path(prefix):
+    """
+    Returns the path of the manifest of the export starting with 'prefix'.
+    """
+    return f"{prefix}-manifest.json"
+
+
+def export_games(games, prefix, chunk_size=4096, deduplicate=False, skip_truncated=True, max_seen=None):
+    """
+    Exports every position of every game in 'games', an iterable of move lists, to chunks starting with 'prefix'.
+    Games are consumed one at a time, so 'games' can be a generator reading from an archive.
+
+    Returns: the number of positions exported
+    """
+
+    with PositionExporter(prefix, chunk_size, deduplicate, skip_truncated, max_seen) as exporter:
+        for moves in games:
+            exporter.add_game(moves)
+    return exporter.get_positions_written()
+
+
+def iter_chunks(prefix):
+    """
+    Lazily reads back an export. Yields one dictionary per chunk listed in the export's manifest, in order, mapping
+    each name in ARRAY_NAMES to a read-only memory-mapped array, so only the data a training job touches is loaded from
+    disk.
+    """
+
+    with open(manifest_path(prefix)) as manifest_file:
+        chunk_lengths = json.load(manifest_file)['chunk_lengths']
+
+    for chunk_index in range(len(chunk_lengths)):
+        yield {name: np.load(chunk_path(prefix, chunk_index, name), mmap_mode='r') for name in ARRAY_NAMES}
@@ -0,0 +1,363 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Contains an append-only journal of chess variant games. Every accepted move is recorded with the
+# resulting position, fsyncs are grouped across all games on a short timer, and unfinished games are rebuilt from a
+# snapshot plus the journal after a restart.
+
+import json
+import os
+import threading
+
+from ChessVar import ChessVar
+from ChessVarPool import pack_position, unpack_position
+
+LOG_NAME = 'journal.log'
+SNAPSHOT_NAME = 'snapshot.json'
+
+
+class GameJournal:
+    """
+    Represents a set of live ChessVar games whose moves are journaled to a directory on disk.
+
+    Each record is one line of JSON holding the game id, the squares moved from and to (None when a game is created),
+    and the resulting position packed by ChessVarPool.pack_position, in hex. Because every record holds a full
+    position, recovery does not depend on replaying moves through make_move.
+
+    Records are queued in memory and a background thread writes and fsyncs everything queued every 'commit_interval'
+    seconds, so one fsync covers the moves of many games. After 'compact_every' records the unfinished games are
+    written to a snapshot and the journal is emptied.
+
+    Contains the following methods:
+        -new_game: creates and journals a new game
+        -make_move: plays a move on a game and journals it if it is accepted or changed the game
+        -get_game / get_games: return the live games
+        -sync: waits until every queued record is on disk
+        -compact: snapshots the unfinished games and empties the journal
+        -close: writes any queued records and stops the background thread
+    """
+
+    def __init__(self, directory, commit_interval=0.005, compact_every=100000):
+        """
+        Opens the journal in 'directory', creating it if needed, and rebuilds every unfinished game recorded there.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._log_path = os.path.join(directory, LOG_NAME)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self._commit_interval = commit_interval
+        self._compact_every = compact_every
+
+        self._games = self._recover()
+        self._log = open(self._log_path, 'ab')
+
+        # _lock guards the games and the queue; _write_lock serializes writes to the journal and snapshot files.
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+        self._pending = []
+        self._queued_count = 0
+        self._durable_count = 0
+        self._records_since_compaction = 0
+
+        # _closed stops new records from being queued; _shut_down is set once the final commit has been attempted.
+        # _failure holds the error that stopped records from being written, after which the journal refuses new ones.
+        self._closed = False
+        self._shut_down = False
+        self._failure = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_game(self, game_id):
+        """
+        Returns the live game with id 'game_id', or None if there is no unfinished game with that id.
+        """
+        with self._lock:
+            return self._games.get(game_id)
+
+    def get_games(self):
+        """
+        Returns a dictionary of game id to ChessVar for every live game.
+        """
+        with self._lock:
+            return dict(self._games)
+
+    def new_game(self, game_id, wait=True):
+        """
+        Creates a game with id 'game_id', which must be JSON serializable and not already in use, and journals it.
+
+        Returns: the new ChessVar
+        """
+
+        game = ChessVar()
+        with self._lock:
+            self._check_open()
+            if game_id in self._games:
+                raise ValueError(f"Game {game_id!r} already exists")
+            self._games[game_id] = game
+            count = self._queue(game_id, None, None, game)
+
+        if wait:
+            self._wait_durable(count)
+        return game
+
+    def make_move(self, game_id, from_square, to_square, wait=True):
+        """
+        Plays a move on game 'game_id' and journals it if the game accepts it. A game that is won is no longer live.
+
+        ChessVar can change a game even when it rejects a move (Pawn.is_valid_move may mark the pawn as moved), so a
+        rejected move whose game changed is journaled too, keeping recovered games identical to the live ones.
+
+        Inputs: the game id, 2x strings representing square moved from and square moved to, and whether to wait until
+         the move is on disk before returning. Callers that do not wait can use sync later.
+
+        Returns: the result of the game's make_move
+        """
+
+        with self._lock:
+            self._check_open()
+            game = self._games.get(game_id)
+            if game is None:
+                raise KeyError(f"No unfinished game {game_id!r}")
+
+            before = pack_position(game)
+            accepted = game.make_move(from_square, to_square)
+            if not accepted and pack_position(game) == before:
+                return accepted
+
+            count = self._queue(game_id, from_square.upper(), to_square.upper(), game)
+            if game.get_game_state() != 'UNFINISHED':
+                del self._games[game_id]
+
+        if wait:
+            self._wait_durable(count)
+        return accepted
+
+    def sync(self):
+        """
+        Waits until every record queued so far is on disk.
+        """
+
+        with self._lock:
+            count = self._queued_count
+        self._wait_durable(count)
+
+    def compact(self):
+        """
+        Writes every unfinished game to a new snapshot and empties the journal.
+        """
+
+        with self._lock:
+            self._check_open()
+        self._compact()
+
+    def _compact(self):
+        """
+        Body of compact, also called by the background thread, which close stops before closing the journal file.
+        """
+
+        with self._write_lock:
+            with self._lock:
+                batch, count = self._take_pending()
+                snapshot = [[game_id, pack_position(game).hex()] for game_id, game in self._games.items()]
+                self._records_since_compaction = 0
+
+            self._write(batch, count)
+
+            temporary_path = self._snapshot_path + '.tmp'
+            with open(temporary_path, 'w') as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+                snapshot_file.flush()
+                os.fsync(snapshot_file.fileno())
+            os.replace(temporary_path, self._snapshot_path)
+            self._fsync_directory()
+
+            # Every record written so far is covered by the snapshot. If the process dies before this truncation,
+            # recovery replays them over the snapshot, which gives the same positions.
+            self._log.truncate(0)
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+    def close(self):
+        """
+        Stops accepting records, writes any queued records, stops the background thread, and closes the journal file.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._stop_event.set()
+        self._thread.join()
+        try:
+            if self._failure is None:
+                self._commit()
+        finally:
+            with self._lock:
+                self._shut_down = True
+                self._committed.notify_all()
+            self._log.close()
+
+    def _check_open(self):
+        """
+        Raises RuntimeError if writing the journal has failed, or ValueError if it has been closed. Must be called
+        holding _lock.
+        """
+
+        if self._failure is not None:
+            raise RuntimeError("The journal can no longer be written") from self._failure
+        if self._closed:
+            raise ValueError("The journal is closed")
+
+    def _queue(self, game_id, from_square, to_square, game):
+        """
+        Queues a record of 'game' after a move. Must be called holding _lock.
+
+        Returns: the number of records queued so far, to wait on with _wait_durable
+        """
+
+        record = {'game': game_id, 'from': from_square, 'to': to_square, 'state': pack_position(game).hex()}
+        self._pending.append(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+        self._queued_count += 1
+        self._records_since_compaction += 1
+        return self._queued_count
+
+    def _take_pending(self):
+        """
+        Removes and returns the queued records together with the count they bring the journal up to. Must be called
+        holding _lock.
+        """
+
+        batch = self._pending
+        self._pending = []
+        return batch, self._queued_count
+
+    def _write(self, batch, count):
+        """
+        Appends a batch of records to the journal, fsyncs it, and wakes callers waiting for them. Must be called
+        holding _write_lock.
+        """
+
+        if batch:
+            try:
+                self._log.write(b''.join(batch))
+                self._log.flush()
+                os.fsync(self._log.fileno())
+            except Exception as exc:
+                self._fail(exc)
+                raise
+
+        with self._lock:
+            if count > self._durable_count:
+                self._durable_count = count
+                self._committed.notify_all()
+
+    def _fail(self, exc):
+        """
+        Records the error that stopped the journal from being written and wakes every caller waiting on a record, so
+        they raise instead of waiting forever.
+        """
+
+        with self._lock:
+            if self._failure is None:
+                self._failure = exc
+            self._committed.notify_all()
+
+    def _commit(self):
+        """
+        Writes every queued record to disk in one group.
+        """
+
+        with self._write_lock:
+            with self._lock:
+                batch, count = self._take_pending()
+            self._write(batch, count)
+
+    def _wait_durable(self, count):
+        """
+        Waits until the first 'count' records are on disk.
+        """
+
+        with self._lock:
+            while self._durable_count < count:
+                if self._failure is not None:
+                    raise RuntimeError("The journal failed before the record was written") from self._failure
+                if self._shut_down:
+                    raise RuntimeError("The journal was closed without writing the record")
+                self._committed.wait()
+
+    def _run(self):
+        """
+        Background thread body: commits queued records every 'commit_interval' seconds, and compacts the journal once
+        enough records have been written since the last compaction. An error ends the thread after being recorded with
+        _fail, so callers see it rather than waiting for a commit that will never come.
+        """
+
+        try:
+            while not self._stop_event.wait(self._commit_interval):
+                self._commit()
+                if self._records_since_compaction >= self._compact_every:
+                    self._compact()
+        except Exception as exc:
+            self._fail(exc)
+
+    def _recover(self):
+        """
+        Rebuilds the unfinished games from the snapshot and the journal. A record cut short by a crash ends the
+        journal; it and anything after it are removed so new records are appended after the last complete one.
+
+        Returns: a dictionary of game id to ChessVar
+        """
+
+        games = {}
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path) as snapshot_file:
+                for game_id, state in json.load(snapshot_file):
+                    games[game_id] = unpack_position(bytes.fromhex(state))
+
+        if not os.path.exists(self._log_path):
+            return games
+
+        valid_length = 0
+        with open(self._log_path, 'rb') as log_file:
+            for line in log_file:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                    game = unpack_position(bytes.fromhex(record['state']))
+                except (ValueError, KeyError, IndexError):
+                    break
+
+                if game.get_game_state() == 'UNFINISHED':
+                    games[record['game']] = game
+                else:
+                    games.pop(record['game'], None)
+                valid_length += len(line)
+
+        if valid_length < os.path.getsize(self._log_path):
+            with open(self._log_path, 'r+b') as log_file:
+                log_file.truncate(valid_length)
+                os.fsync(log_file.fileno())
+
+        return games
+
+    def _fsync_directory(self):
+        """
+        Makes a rename in the journal directory durable.
+        """
+
+        directory = os.open(self._directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
@@ -0,0 +1,297 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Contains a pool of chess variant positions stored in shared memory in a fixed, compact layout, so
+# worker processes can read and write positions in place instead of pickling ChessVar objects.
+
+import multiprocessing
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from ChessVar import ChessVar, Pawn, Rook, Knight, Bishop, Queen, King
+
+PIECE_CLASSES = (Pawn, Rook, Knight, Bishop, Queen, King)
+PIECE_TYPES = ('Pawn', 'Rook', 'Knight', 'Bishop', 'Queen', 'King')
+TEAMS = ('WHITE', 'BLACK')
+GAME_STATES = ('UNFINISHED', 'WHITE_WON', 'BLACK_WON')
+COLUMNS = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H')
+ROWS = ('1', '2', '3', '4', '5', '6', '7', '8')
+
+# Layout of one packed position, in bytes:
+#   0-63: one code per square, ordered A1, B1, ..., H1, A2, ..., H8. 0 is an empty square, otherwise the code is
+#         'team * 6 + type + 1' with types ordered as in PIECE_TYPES, plus MOVED_FLAG for a Pawn that has moved.
+#   64: side to move, as an index into TEAMS
+#   65: game state, as an index into GAME_STATES
+#   66-77: white then black pieces remaining, by type
+#   78-79: unused
+SQUARES_OFFSET = 0
+TURN_OFFSET = 64
+STATE_OFFSET = 65
+COUNTS_OFFSET = 66
+POSITION_SIZE = 80
+
+MOVED_FLAG = 0x80
+
+
+def square_index(square):
+    """
+    Returns the index of an algebraic square such as 'E4' in the packed layout.
+    """
+
+    square = square.upper()
+    return ROWS.index(square[1]) * 8 + COLUMNS.index(square[0])
+
+
+def encode_piece(piece):
+    """
+    Returns the one byte code of a Piece, or 0 for None.
+    """
+
+    if piece is None:
+        return 0
+
+    code = TEAMS.index(piece.get_team()) * 6 + PIECE_TYPES.index(piece.get_type()) + 1
+    if piece.get_type() == 'Pawn' and piece.get_has_moved():
+        code |= MOVED_FLAG
+    return code
+
+
+def decode_piece(code, square):
+    """
+    Returns a new Piece on 'square' for a one byte code, or None for 0.
+    """
+
+    if code == 0:
+        return None
+
+    team_and_type = (code & ~MOVED_FLAG) - 1
+    piece = PIECE_CLASSES[team_and_type % 6](TEAMS[team_and_type // 6], square)
+    if code & MOVED_FLAG:
+        piece.set_has_moved()
+    return piece
+
+
+def pack_position(game, buffer=None):
+    """
+    Packs the position of a ChessVar game into POSITION_SIZE bytes.
+
+    Inputs: a ChessVar game, and optionally a writable buffer of POSITION_SIZE bytes to pack into
+
+    Returns: the buffer, or a new bytearray if none was given
+    """
+
+    if buffer is None:
+        buffer = bytearray(POSITION_SIZE)
+
+    board = game.get_board()
+    for row_index, row in enumerate(ROWS):
+        for column_index, column in enumerate(COLUMNS):
+            buffer[SQUARES_OFFSET + row_index * 8 + column_index] = encode_piece(board[column][row])
+
+    buffer[TURN_OFFSET] = TEAMS.index(game.get_current_turn())
+    buffer[STATE_OFFSET] = GAME_STATES.index(game.get_game_state())
+
+    white_pieces = game.get_white_pieces_remaining()
+    black_pieces = game.get_black_pieces_remaining()
+    for type_index, piece_type in enumerate(PIECE_TYPES):
+        buffer[COUNTS_OFFSET + type_index] = white_pieces[piece_type]
+        buffer[COUNTS_OFFSET + 6 + type_index] = black_pieces[piece_type]
+
+    return buffer
+
+
+def unpack_position(buffer):
+    """
+    Builds a ChessVar game from a position packed by pack_position.
+
+    Input: a buffer of at least POSITION_SIZE bytes
+
+    Returns: a new ChessVar
+    """
+
+    # The starting pieces made by ChessVar() would all be replaced, so the game is built without calling __init__.
+    game = ChessVar.__new__(ChessVar)
+
+    game._board = {column: {row: decode_piece(buffer[SQUARES_OFFSET + row_index * 8 + column_index], column + row)
+                            for row_index, row in enumerate(ROWS)}
+                   for column_index, column in enumerate(COLUMNS)}
+
+    game._current_player = TEAMS[buffer[TURN_OFFSET]]
+    game._game_state = GAME_STATES[buffer[STATE_OFFSET]]
+    game._white_pieces = {piece_type: buffer[COUNTS_OFFSET + type_index]
+                          for type_index, piece_type in enumerate(PIECE_TYPES)}
+    game._black_pieces = {piece_type: buffer[COUNTS_OFFSET + 6 + type_index]
+                          for type_index, piece_type in enumerate(PIECE_TYPES)}
+
+    return game
+
+
+def _attach(name, creator_pid=None):
+    """
+    Attaches to the existing shared memory block 'name' without making this process responsible for it.
+
+    Before Python 3.13, attaching registers the block with this process's resource tracker, which unlinks it when the
+    tracker's processes exit, so an unrelated process that attached and exited would destroy the pool. The
+    registration is undone here, except in the creating process 'creator_pid' and its multiprocessing workers: they
+    share the creator's tracker, where the block is already registered, and unregistering it from several workers at
+    once would fail.
+    """
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    memory = shared_memory.SharedMemory(name=name)
+    parent = multiprocessing.parent_process()
+    shares_tracker = creator_pid is not None and (os.getpid() == creator_pid or
+                                                  (parent is not None and parent.pid == creator_pid))
+    if not shares_tracker:
+        resource_tracker.unregister(memory._name, 'shared_memory')
+    return memory
+
+
+class PositionPool:
+    """
+    Represents a fixed number of position slots in a multiprocessing.shared_memory block. Each slot holds one position
+    packed as described above, so processes attached to the pool can read and write positions in place by index.
+
+    Pickling a PositionPool only pickles its name, size, and creating process: a pool passed to a worker process
+    attaches to the same shared memory rather than copying it. Other processes can attach with
+    PositionPool(size, name, create=False). Attaching never makes a process responsible for freeing the pool; the
+    creating process should call unlink when the pool is no longer needed.
+
+    Contains the following methods:
+        -store: packs a ChessVar into a slot
+        -load: builds a ChessVar from a slot
+        -get_slot: returns a writable memoryview of a slot's bytes
+        -read_square / write_square: read or write the piece on one square of a slot
+        -get_current_turn / get_game_state: read those fields of a slot
+        -close: detaches this process from the pool
+        -unlink: frees the shared memory once every process has closed it
+    """
+
+    def __init__(self, size, name=None, create=True, creator_pid=None):
+        """
+        Creates a pool of 'size' empty slots, or attaches to the existing pool called 'name' if 'create' is False.
+        'creator_pid' is the process that created the pool, when known; see _attach.
+        """
+
+        if size < 1:
+            raise ValueError("A PositionPool needs at least one slot")
+
+        self._size = size
+        if create:
+            self._memory = shared_memory.SharedMemory(name=name, create=True, size=size * POSITION_SIZE)
+            self._creator_pid = os.getpid()
+        else:
+            self._memory = _attach(name, creator_pid)
+            self._creator_pid = creator_pid
+            if self._memory.size < size * POSITION_SIZE:
+                self._memory.close()
+                raise ValueError(f"Shared memory '{name}' is too small for {size} positions")
+
+    def __reduce__(self):
+        return PositionPool, (self._size, self._memory.name, False, self._creator_pid)
+
+    def __len__(self):
+        return self._size
+
+    def get_name(self):
+        """
+        Returns the name other processes can use to attach to the pool.
+        """
+        return self._memory.name
+
+    def get_slot(self, index):
+        """
+        Returns a writable memoryview of the POSITION_SIZE bytes of slot 'index'.
+        """
+
+        offset = self._offset(index)
+        return self._memory.buf[offset:offset + POSITION_SIZE]
+
+    def _offset(self, index):
+        """
+        Returns the byte offset of slot 'index', raising IndexError if it is out of range.
+        """
+
+        if not 0 <= index < self._size:
+            raise IndexError(f"Slot {index} is out of range for a pool of {self._size}")
+        return index * POSITION_SIZE
+
+    def store(self, index, game):
+        """
+        Packs the position of 'game' into slot 'index'.
+        """
+
+        slot = self.get_slot(index)
+        try:
+            pack_position(game, slot)
+        finally:
+            slot.release()
+
+    def load(self, index):
+        """
+        Returns a new ChessVar built from the position in slot 'index'.
+        """
+
+        slot = self.get_slot(index)
+        try:
+            return unpack_position(slot)
+        finally:
+            slot.release()
+
+    def read_square(self, index, square):
+        """
+        Returns the piece on 'square' in slot 'index' as a tuple of (team, type, has_moved), or None if it is empty.
+        """
+
+        code = self._memory.buf[self._offset(index) + SQUARES_OFFSET + square_index(square)]
+        if code == 0:
+            return None
+
+        team_and_type = (code & ~MOVED_FLAG) - 1
+        return TEAMS[team_and_type // 6], PIECE_TYPES[team_and_type % 6], bool(code & MOVED_FLAG)
+
+    def write_square(self, index, square, team=None, piece_type=None, has_moved=False):
+        """
+        Puts a piece of 'team' and 'piece_type' on 'square' in slot 'index', or empties the square if 'team' is None.
+        Pieces remaining counts are not changed.
+        """
+
+        code = 0
+        if team is not None:
+            code = TEAMS.index(team) * 6 + PIECE_TYPES.index(piece_type) + 1
+            if has_moved and piece_type == 'Pawn':
+                code |= MOVED_FLAG
+
+        self._memory.buf[self._offset(index) + SQUARES_OFFSET + square_index(square)] = code
+
+    def get_current_turn(self, index):
+        """
+        Returns 'WHITE' or 'BLACK' for the position in slot 'index'.
+        """
+        return TEAMS[self._memory.buf[self._offset(index) + TURN_OFFSET]]
+
+    def get_game_state(self, index):
+        """
+        Returns the game state of the position in slot 'index'.
+        """
+        return GAME_STATES[self._memory.buf[self._offset(index) + STATE_OFFSET]]
+
+    def close(self):
+        """
+        Detaches this process from the pool. Any memoryview from get_slot must be released first.
+        """
+        self._memory.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory. Should be called once, by the process that created the pool.
+        """
+
+        # A process sharing this process's resource tracker may have attached by name alone and unregistered the block
+        # (see _attach). Registering again is harmless if it did not, and lets unlink unregister it without an error.
+        if sys.version_info < (3, 13):
+            resource_tracker.register(self._memory._name, 'shared_memory')
+        self._memory.unlink()
@@ -0,0 +1,37 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Tests for the search in ChessVarAnalysis.
+
+import contextlib
+import io
+import unittest
+
+from ChessVar import ChessVar
+from ChessVarAnalysis import WIN_SCORE, search
+
+
+class TestSearch(unittest.TestCase):
+    """
+    Contains unit tests for the ChessVarAnalysis search.
+    """
+
+    def test_one_ply_search_captures_last_piece_of_a_type(self):
+        """
+        With BLACK's only Queen on D5, the search should play the Knight capture that wins the game.
+        """
+
+        game = ChessVar()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for from_square, to_square in [('e2', 'e4'), ('d7', 'd5'), ('e4', 'd5'), ('d8', 'd5'), ('b1', 'c3'),
+                                           ('a7', 'a6')]:
+                self.assertTrue(game.make_move(from_square, to_square))
+            score, line = search(game, 1)
+
+        self.assertEqual(line, [('C3', 'D5')])
+        self.assertEqual(score, WIN_SCORE)
+        self.assertEqual(game.get_game_state(), 'UNFINISHED')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Tests for the crash recovery of the game journal in ChessVarJournal.
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from ChessVarJournal import LOG_NAME, SNAPSHOT_NAME, GameJournal
+from ChessVarPool import pack_position
+
+# A game ending with WHITE capturing BLACK's only Queen, played up to the capture.
+OPENING = [('e2', 'e4'), ('d7', 'd5'), ('e4', 'd5'), ('d8', 'd5'), ('b1', 'c3'), ('a7', 'a6')]
+WINNING_MOVE = ('c3', 'd5')
+
+
+class TestGameJournal(unittest.TestCase):
+    """
+    Contains unit tests for GameJournal recovery.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # ChessVar prints every move.
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+
+    def tearDown(self):
+        self.quiet.__exit__(None, None, None)
+        shutil.rmtree(self.directory)
+
+    def play(self, journal, game_id, moves):
+        """
+        Plays 'moves' on game 'game_id', checking each is accepted.
+        """
+
+        for from_square, to_square in moves:
+            self.assertTrue(journal.make_move(game_id, from_square, to_square))
+
+    def reopen_states(self):
+        """
+        Recovers the journal and returns a dictionary of game id to packed position.
+        """
+
+        journal = GameJournal(self.directory)
+        states = {game_id: pack_position(game) for game_id, game in journal.get_games().items()}
+        journal.close()
+        return states
+
+    def test_recovery_after_close(self):
+        """
+        Unfinished games should be recovered exactly and finished games dropped.
+        """
+
+        with GameJournal(self.directory) as journal:
+            journal.new_game('live')
+            journal.new_game('won')
+            self.play(journal, 'live', OPENING[:3])
+            self.play(journal, 'won', OPENING + [WINNING_MOVE])
+            expected = pack_position(journal.get_game('live'))
+
+        self.assertEqual(self.reopen_states(), {'live': expected})
+
+    def test_recovery_after_partial_trailing_line(self):
+        """
+        A record cut short by a crash should be ignored and removed, and later records should still be recovered.
+        """
+
+        with GameJournal(self.directory) as journal:
+            journal.new_game('a')
+            self.play(journal, 'a', OPENING[:2])
+            expected = pack_position(journal.get_game('a'))
+
+        with open(os.path.join(self.directory, LOG_NAME), 'ab') as log_file:
+            log_file.write(b'{"game":"a","from":"B1"')
+
+        with GameJournal(self.directory) as journal:
+            self.assertEqual(pack_position(journal.get_game('a')), expected)
+            self.play(journal, 'a', OPENING[2:3])
+            expected = pack_position(journal.get_game('a'))
+
+        self.assertEqual(self.reopen_states(), {'a': expected})
+
+    def test_recovery_after_compaction(self):
+        """
+        Games should be rebuilt from the snapshot plus the records written after it.
+        """
+
+        with GameJournal(self.directory) as journal:
+            journal.new_game('a')
+            journal.new_game('b')
+            self.play(journal, 'a', OPENING[:2])
+            journal.compact()
+            self.assertEqual(os.path.getsize(os.path.join(self.directory, LOG_NAME)), 0)
+            self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_NAME)))
+            self.play(journal, 'a', OPENING[2:4])
+            self.play(journal, 'b', OPENING[:1])
+            expected = {game_id: pack_position(game) for game_id, game in journal.get_games().items()}
+
+        self.assertEqual(self.reopen_states(), expected)
+
+    def test_recovery_after_crash_between_snapshot_and_truncation(self):
+        """
+        If the journal was not emptied after a snapshot was written, replaying it over the snapshot should give the
+        same games, including dropping a game finished before the snapshot.
+        """
+
+        log_path = os.path.join(self.directory, LOG_NAME)
+        with GameJournal(self.directory) as journal:
+            journal.new_game('a')
+            journal.new_game('won')
+            self.play(journal, 'a', OPENING[:3])
+            self.play(journal, 'won', OPENING + [WINNING_MOVE])
+            journal.sync()
+            with open(log_path, 'rb') as log_file:
+                old_log = log_file.read()
+            journal.compact()
+            expected = {'a': pack_position(journal.get_game('a'))}
+
+        with open(log_path, 'wb') as log_file:
+            log_file.write(old_log)
+
+        self.assertEqual(self.reopen_states(), expected)
+
+    def test_rejected_move_that_changes_the_game_is_recovered(self):
+        """
+        A rejected Pawn capture onto the player's own piece marks the Pawn as moved, so the live game rejects a later
+        two square Pawn move. The recovered game should too.
+        """
+
+        with GameJournal(self.directory) as journal:
+            journal.new_game('a')
+            self.play(journal, 'a', [('d2', 'd3'), ('a7', 'a6')])
+            self.assertFalse(journal.make_move('a', 'c2', 'd3'))
+            expected = pack_position(journal.get_game('a'))
+
+        self.assertEqual(self.reopen_states(), {'a': expected})
+        with GameJournal(self.directory) as journal:
+            self.assertFalse(journal.make_move('a', 'c2', 'c4'))
+
+    def test_write_failure_raises_instead_of_hanging(self):
+        """
+        If fsync fails in the background thread, waiting callers and later moves should raise RuntimeError.
+        """
+
+        journal = GameJournal(self.directory)
+        result = {}
+
+        def create_game():
+            try:
+                journal.new_game('a')
+            except RuntimeError as exc:
+                result['error'] = exc
+
+        with mock.patch('ChessVarJournal.os.fsync', side_effect=OSError("disk failed")):
+            caller = threading.Thread(target=create_game)
+            caller.start()
+            caller.join(5)
+
+        self.assertFalse(caller.is_alive())
+        self.assertIsInstance(result.get('error'), RuntimeError)
+        with self.assertRaises(RuntimeError):
+            journal.new_game('b')
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
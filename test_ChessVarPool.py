@@ -0,0 +1,94 @@
+# Author: Tavner Murphy
+# GitHub username: tavmurphy1
+# Date: 10/19/26
+# Description: Tests for the shared-memory position pool in ChessVarPool.
+
+import contextlib
+import io
+import multiprocessing
+import os
+import subprocess
+import sys
+import unittest
+
+from ChessVar import ChessVar
+from ChessVarPool import PositionPool, pack_position
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def _read_turn(pool):
+    """
+    Worker used by the tests: reads slot 0 of a pool passed to it, then detaches.
+    """
+
+    turn = pool.get_current_turn(0)
+    pool.close()
+    return turn
+
+
+class TestPositionPool(unittest.TestCase):
+    """
+    Contains unit tests for PositionPool.
+    """
+
+    def setUp(self):
+        self.pool = PositionPool(2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.pool.unlink()
+
+    def test_store_and_load_round_trip(self):
+        """
+        A position loaded from a slot should pack to the same bytes as the stored game.
+        """
+
+        game = ChessVar()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.make_move('e2', 'e4')
+        self.pool.store(1, game)
+
+        self.assertEqual(pack_position(self.pool.load(1)), pack_position(game))
+        self.assertEqual(self.pool.read_square(1, 'e4'), ('WHITE', 'Pawn', True))
+        self.assertEqual(self.pool.get_current_turn(1), 'BLACK')
+
+    def test_separate_process_attach_and_exit_leaves_pool_intact(self):
+        """
+        An unrelated process attaching by name and exiting should not free the pool.
+        """
+
+        self.pool.store(0, ChessVar())
+        code = ("from ChessVarPool import PositionPool\n"
+                f"pool = PositionPool(2, {self.pool.get_name()!r}, create=False)\n"
+                "print(pool.load(0).get_current_turn())\n"
+                "pool.close()\n")
+        result = subprocess.run([sys.executable, '-c', code], cwd=PACKAGE_DIRECTORY, capture_output=True, text=True)
+
+        self.assertEqual(result.stdout.strip(), 'WHITE')
+        self.assertNotIn('leaked', result.stderr)
+        attached = PositionPool(2, self.pool.get_name(), create=False)
+        self.assertEqual(attached.get_game_state(0), 'UNFINISHED')
+        attached.close()
+
+    def test_worker_processes_attach_through_pickling(self):
+        """
+        A pool passed to worker processes should be readable there and still usable afterwards.
+        """
+
+        self.pool.store(0, ChessVar())
+        with multiprocessing.Pool(2) as workers:
+            self.assertEqual(workers.map(_read_turn, [self.pool, self.pool]), ['WHITE', 'WHITE'])
+        self.assertEqual(self.pool.get_current_turn(0), 'WHITE')
+
+    def test_failed_store_releases_slot(self):
+        """
+        A store that raises should not leave a slot exported, which would make close fail.
+        """
+
+        with self.assertRaises(AttributeError):
+            self.pool.store(0, None)
+
+
+if __name__ == '__main__':
+    unittest.main()